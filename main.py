@@ -1,10 +1,11 @@
 import argparse
-from src.video_processor import VideoProcessor
+from src.host_profile import DEFAULTS, load_profile
+from src.results import save_results
 
 
 def main():
     parser = argparse.ArgumentParser(description="Squat Analysis Video Processor")
-    parser.add_argument("--input", "-i", required=True, help="Input video path")
+    parser.add_argument("--input", "-i", required=True, help="Input video path or frame store directory")
     parser.add_argument("--output", "-o", help="Output annotated video path")
     parser.add_argument("--json", "-j", help="Output JSON results path")
     parser.add_argument("--side", choices=["left", "right"], default="left",
@@ -15,22 +16,81 @@ def main():
                         help="Rise threshold for rep count (default: 20)")
     parser.add_argument("--smooth", type=float, default=0.3,
                         help="EMA smoothing factor 0.1-0.9 (lower=smoother, default: 0.3)")
+    parser.add_argument("--checkpoint", help="Checkpoint file path for resumable processing")
+    parser.add_argument("--checkpoint-every", type=int, default=1000,
+                        help="Save checkpoint every N frames (default: 1000)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume from the last checkpoint (requires --checkpoint); results right after "
+                             "the resume point can differ slightly because MediaPipe tracking restarts")
+    parser.add_argument("--start", type=int, default=0,
+                        help="First frame to process (default: 0)")
+    parser.add_argument("--end", type=int,
+                        help="Stop before this frame (default: end of video)")
+    parser.add_argument("--model-complexity", type=int, choices=[0, 1, 2],
+                        help="Pose model complexity (default: host profile or 1)")
+    parser.add_argument("--detection-scale", type=float,
+                        help="Downscale factor for pose detection input (default: host profile or 1.0)")
+    parser.add_argument("--workers", type=int,
+                        help="Worker processes (default: host profile or 1)")
+    parser.add_argument("--profile", help="Host profile path written by src.autotune")
+    parser.add_argument("--no-profile", action="store_true", help="Ignore the host profile")
     args = parser.parse_args()
     
-    processor = VideoProcessor(
+    if args.start < 0 or (args.end is not None and args.end <= args.start):
+        parser.error("--end must be greater than --start, and --start must be non-negative")
+    
+    if args.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+    if args.resume and args.output:
+        parser.error("--resume cannot be combined with --output")
+    
+    # Явные аргументы важнее профиля хоста, профиль — важнее значений по умолчанию
+    profile = {} if args.no_profile else load_profile(args.profile)
+    settings = dict(DEFAULTS, **profile)
+    for key in DEFAULTS:
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    if settings["workers"] < 1:
+        parser.error("--workers must be at least 1")
+    if settings["workers"] > 1 and (args.output or args.checkpoint):
+        if args.workers is not None:
+            parser.error("--workers > 1 cannot be combined with --output or --checkpoint")
+        settings["workers"] = 1
+    
+    processor_kwargs = dict(
         bottom_threshold=args.bottom,
         rise_threshold=args.rise,
-        ema_alpha=args.smooth
+        ema_alpha=args.smooth,
+        model_complexity=settings["model_complexity"],
+        detection_scale=settings["detection_scale"],
     )
     
     print(f"Processing: {args.input}")
-    results = processor.process(args.input, args.output, args.side)
+    if profile:
+        print(f"Host profile settings: {settings}")
+    # cv2/mediapipe загружаются только после разбора аргументов, чтобы --help и ошибки были быстрыми
+    if settings["workers"] > 1:
+        from src.parallel import process_parallel
+        results = process_parallel(args.input, settings["workers"], args.side,
+                                   start_frame=args.start, end_frame=args.end,
+                                   **processor_kwargs)
+    else:
+        from src.video_processor import VideoProcessor
+        processor = VideoProcessor(**processor_kwargs)
+        results = processor.process(args.input, args.output, args.side,
+                                    checkpoint_path=args.checkpoint,
+                                    checkpoint_every=args.checkpoint_every,
+                                    resume=args.resume,
+                                    start_frame=args.start,
+                                    end_frame=args.end)
     
     final_reps = results[-1]["reps"] if results else 0
     print(f"Total reps: {final_reps}")
     
     if args.json:
-        processor.save_results(results, args.json)
+        save_results(results, args.json)
         print(f"Results saved: {args.json}")
     
     if args.output:
@@ -0,0 +1,199 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+from src.frame_store import FrameStore
+from src.host_profile import DEFAULTS, PROFILE_ENV, save_profile, profile_path
+from src.parallel import run_segments, merge_segments
+from src.pose_detector import PoseDetector
+from src.video_processor import VideoProcessor
+
+
+TARGET_SECONDS = 600  # типичная длина видео, на которую пересчитывается скорость
+TARGET_FRAMES = TARGET_SECONDS * 30
+REP_FRAME_TOLERANCE = 3  # допустимый сдвиг кадра завершения повтора относительно эталона
+
+
+def source_fps(input_path):
+    if FrameStore.is_store(input_path):
+        return FrameStore(input_path).fps
+    cap = cv2.VideoCapture(input_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap.release()
+    return fps or 30.0
+
+
+def candidate_configs(model_complexities=(0, 1, 2), detection_scales=(1.0, 0.75, 0.5), workers=None):
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        workers = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    for mc, scale, w in itertools.product(model_complexities, detection_scales, workers):
+        yield {"model_complexity": mc, "detection_scale": scale, "workers": w}
+
+
+def model_available(model_complexity):
+    """Загружается ли модель этой сложности (без сети mediapipe не может скачать 0 и 2)."""
+    try:
+        PoseDetector(model_complexity=model_complexity).close()
+    except (OSError, RuntimeError):
+        return False
+    return True
+
+
+def _start_processor(processor_kwargs):
+    VideoProcessor(**processor_kwargs)
+
+
+def measure_startup(workers, processor_kwargs):
+    """
+    Время запуска: spawn workers процессов и создание VideoProcessor в каждом
+    (импорт mediapipe, загрузка модели). Для workers=1 это приближает старт самого main.py.
+    """
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for f in [pool.submit(_start_processor, processor_kwargs) for _ in range(workers)]:
+            f.result()
+    return time.perf_counter() - t0
+
+
+def timed_segment(input_path, start, end, side="left", warmup=90, processor_kwargs=None):
+    """process_segment, который дополнительно возвращает скорость обработки без учёта запуска."""
+    processor = VideoProcessor(**(processor_kwargs or {}))
+    first = max(0, start - warmup)
+    t0 = time.perf_counter()
+    results = processor.process(input_path, side=side, start_frame=first, end_frame=end)
+    elapsed = time.perf_counter() - t0
+    fps = (end - first) / elapsed if elapsed > 0 else float("inf")
+    return [r for r in results if r["frame"] >= start], fps
+
+
+def projected_fps(target_frames, workers, startup, segment_fps, warmup=90):
+    """
+    Скорость на видео из target_frames кадров: запуск платится один раз, затем каждый
+    процесс обрабатывает свою долю кадров (плюс прогрев, если процессов несколько).
+    """
+    per_worker = target_frames / workers + (warmup if workers > 1 else 0)
+    return target_frames / (startup + per_worker / segment_fps)
+
+
+def benchmark(input_path, config, frames, side="left", target_frames=TARGET_FRAMES):
+    """
+    Прогон одной конфигурации на первых frames кадрах. Запуск (процессы, mediapipe, модель)
+    и установившаяся скорость меряются отдельно и пересчитываются на видео из target_frames
+    кадров: на коротком образце запуск нескольких процессов иначе перевешивал бы выигрыш,
+    который они дают на обычном длинном видео.
+    """
+    processor_kwargs = {k: config[k] for k in ("model_complexity", "detection_scale")}
+    workers = config["workers"]
+    startup = measure_startup(workers, processor_kwargs)
+    if workers == 1:
+        timed = [timed_segment(input_path, 0, frames, side, processor_kwargs=processor_kwargs)]
+    else:
+        timed = run_segments(input_path, workers, side, 0, frames, processor_kwargs=processor_kwargs,
+                             segment_fn=timed_segment)
+    # Время определяет самый медленный процесс
+    segment_fps = min(fps for _, fps in timed)
+    results = merge_segments([segment for segment, _ in timed])
+    return results, projected_fps(target_frames, workers, startup, segment_fps)
+
+
+def rep_frames(results):
+    """Кадры, на которых завершился очередной повтор."""
+    frames, reps = [], 0
+    for r in results:
+        if r["reps"] > reps:
+            frames.append(r["frame"])
+            reps = r["reps"]
+    return frames
+
+
+def agreement(results, reference, frame_tolerance=REP_FRAME_TOLERANCE):
+    """
+    (совпадают ли повторы, средняя абсолютная разница углов). Повторы совпадают, если
+    их столько же и каждый завершён не дальше frame_tolerance кадров от эталонного.
+    """
+    frames, ref_frames = rep_frames(results), rep_frames(reference)
+    reps_match = len(frames) == len(ref_frames) and all(
+        abs(f - ref) <= frame_tolerance for f, ref in zip(frames, ref_frames))
+    diffs = [abs(r["angle"] - ref["angle"]) for r, ref in zip(results, reference)
+             if r["angle"] is not None and ref["angle"] is not None]
+    return reps_match, sum(diffs) / len(diffs) if diffs else 0.0
+
+
+def autotune(input_path, frames=300, side="left", max_angle_error=5.0, min_speedup=1.05,
+             configs=None, log=print, target_frames=TARGET_FRAMES):
+    """
+    Выбирает самую быструю конфигурацию, которая согласуется с эталонной (DEFAULTS).
+    Кандидат заменяет текущий лучший, только если быстрее хотя бы в min_speedup раз,
+    чтобы шум измерений не менял настройки. Если в эталоне нет ни одного повтора,
+    сравнивать по ним нечего — бросает ValueError.
+    """
+    # Первый прогон прогревает кэши (файл видео, инициализация mediapipe) и не учитывается
+    benchmark(input_path, dict(DEFAULTS), frames, side, target_frames)
+    reference, reference_fps = benchmark(input_path, dict(DEFAULTS), frames, side, target_frames)
+    reference_reps = rep_frames(reference)
+    if not reference_reps:
+        raise ValueError(f"No completed reps in the first {frames} frames of {input_path}: "
+                         "use a longer --frames or a sample with squats")
+    log(f"Reference {DEFAULTS}: {reference_fps:.1f} fps, reps at frames {reference_reps}")
+
+    measurements = [dict(DEFAULTS, fps=reference_fps, reps_match=True, angle_error=0.0)]
+    best, best_fps = dict(DEFAULTS), reference_fps
+    available = {}
+    for config in configs or candidate_configs():
+        mc = config["model_complexity"]
+        if mc not in available:
+            available[mc] = model_available(mc)
+            if not available[mc]:
+                log(f"Skip model_complexity={mc}: model cannot be loaded")
+        if config == DEFAULTS or not available[mc]:
+            continue
+        results, fps = benchmark(input_path, config, frames, side, target_frames)
+        reps_match, angle_error = agreement(results, reference)
+        ok = reps_match and angle_error <= max_angle_error
+        measurements.append(dict(config, fps=fps, reps_match=reps_match, angle_error=angle_error))
+        log(f"{config}: {fps:.1f} fps, reps_match={reps_match}, angle_error={angle_error:.2f}"
+            + ("" if ok else " (rejected)"))
+        if ok and fps > best_fps * min_speedup:
+            best, best_fps = config, fps
+
+    return best, best_fps, measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline configurations on this host and save a profile")
+    parser.add_argument("--input", "-i", required=True, help="Sample video path or frame store directory")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per benchmark run (default: 300)")
+    parser.add_argument("--side", choices=["left", "right"], default="left",
+                        help="Which leg to analyze (default: left)")
+    parser.add_argument("--max-angle-error", type=float, default=5.0,
+                        help="Max mean angle difference vs. reference, degrees (default: 5)")
+    parser.add_argument("--target-seconds", type=float, default=TARGET_SECONDS,
+                        help=f"Video length the speed is projected to, seconds (default: {TARGET_SECONDS})")
+    parser.add_argument("--profile", help=f"Profile path (default: ${PROFILE_ENV} or {profile_path()})")
+    parser.add_argument("--min-speedup", type=float, default=1.05,
+                        help="Required speedup over the current best to switch (default: 1.05)")
+    args = parser.parse_args()
+    if args.target_seconds <= 0:
+        parser.error("--target-seconds must be positive")
+
+    target_frames = round(args.target_seconds * source_fps(args.input))
+    try:
+        best, fps, measurements = autotune(args.input, args.frames, args.side, args.max_angle_error,
+                                           args.min_speedup, target_frames=target_frames)
+    except ValueError as e:
+        parser.error(str(e))
+    path = save_profile(best, args.profile, host=platform.node(), machine=platform.machine(),
+                        cpus=os.cpu_count(), sample=args.input, frames=args.frames,
+                        target_frames=target_frames,
+                        fps=fps, created=time.strftime("%Y-%m-%dT%H:%M:%S"), measurements=measurements)
+    print(f"Best: {best} ({fps:.1f} fps)")
+    print(f"Profile saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
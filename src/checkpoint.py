@@ -0,0 +1,61 @@
+import json
+import os
+
+
+class CheckpointStore:
+    """
+    Хранилище чекпоинтов для возобновления обработки длинных видео.
+    Состояние процессора пишется атомарно (tmp-файл + os.replace), а
+    покадровые результаты дописываются в журнал JSONL рядом с чекпоинтом,
+    чтобы не перезаписывать всю историю при каждом сохранении.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.results_path = path + ".results.jsonl"
+        self.results_count = 0
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def save(self, state, new_results):
+        # Сначала журнал результатов, затем чекпоинт со ссылкой на его длину:
+        # строки, дописанные после последнего чекпоинта, при загрузке отбрасываются.
+        with open(self.results_path, "a") as f:
+            for r in new_results:
+                f.write(json.dumps(r) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+
+        self.results_count += len(new_results)
+        state = dict(state, results_offset=offset, results_count=self.results_count)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        with open(self.path) as f:
+            state = json.load(f)
+
+        offset = state.pop("results_offset")
+        self.results_count = state.pop("results_count")
+        results = []
+        if os.path.exists(self.results_path):
+            with open(self.results_path, "r+b") as f:
+                data = f.read(offset)
+                f.truncate(offset)
+            results = [json.loads(line) for line in data.decode().splitlines()]
+
+        if len(results) != self.results_count:
+            raise ValueError(f"Corrupt checkpoint results journal: {self.results_path}")
+        return state, results
+
+    def clear(self):
+        self.results_count = 0
+        for p in (self.path, self.results_path, self.path + ".tmp"):
+            if os.path.exists(p):
+                os.remove(p)
@@ -0,0 +1,191 @@
+import argparse
+import bisect
+import json
+import os
+import tempfile
+import cv2
+
+
+INDEX_SUFFIX = ".frameidx.json"
+TIMESTAMP_TOLERANCE_MS = 1.0
+
+
+def index_path(video_path):
+    return video_path + INDEX_SUFFIX
+
+
+class FrameIndex:
+    """
+    Индекс кадров видео: временная метка каждого кадра (в порядке показа)
+    и номера ключевых кадров. Строится один раз и хранится в файле рядом с видео.
+    """
+
+    def __init__(self, timestamps, keyframes, fps, source_size=None, source_mtime=None):
+        self.timestamps = timestamps
+        self.keyframes = keyframes
+        self.fps = fps
+        self.source_size = source_size
+        self.source_mtime = source_mtime
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @classmethod
+    def build(cls, video_path):
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Cannot open video: {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS)
+
+        # Быстрый проход по пакетам без декодирования. Пакеты идут в порядке
+        # декодирования, поэтому номер кадра — ранг его pts среди всех кадров.
+        raw = cap.set(cv2.CAP_PROP_FORMAT, -1)
+        packets = []
+        while cap.grab():
+            is_key = raw and cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME) != 0
+            packets.append((cap.get(cv2.CAP_PROP_POS_MSEC), is_key))
+        cap.release()
+
+        packets.sort()
+        timestamps = [ts for ts, _ in packets]
+        keyframes = [i for i, (_, is_key) in enumerate(packets) if is_key]
+        stat = os.stat(video_path)
+        return cls(timestamps, keyframes, fps, stat.st_size, stat.st_mtime)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["timestamps"], data["keyframes"], data["fps"],
+                   data["source_size"], data["source_mtime"])
+
+    def save(self, path):
+        data = {
+            "fps": self.fps,
+            "source_size": self.source_size,
+            "source_mtime": self.source_mtime,
+            "keyframes": self.keyframes,
+            "timestamps": self.timestamps,
+        }
+        # Уникальный tmp-файл: индекс одного видео могут сохранять несколько процессов сразу
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path) or ".",
+                                         suffix=".tmp", delete=False) as f:
+            json.dump(data, f)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    @classmethod
+    def open(cls, video_path):
+        """Загружает индекс из файла рядом с видео; строит и сохраняет, если его нет или он устарел."""
+        path = index_path(video_path)
+        if os.path.exists(path):
+            index = cls.load(path)
+            if index.matches(video_path):
+                return index
+        index = cls.build(video_path)
+        try:
+            index.save(path)
+        except OSError:
+            pass  # например, каталог только для чтения — работаем с индексом в памяти
+        return index
+
+    def matches(self, video_path):
+        stat = os.stat(video_path)
+        return stat.st_size == self.source_size and stat.st_mtime == self.source_mtime
+
+    def keyframe_before(self, frame):
+        i = bisect.bisect_right(self.keyframes, frame) - 1
+        return self.keyframes[i] if i >= 0 else None
+
+
+class IndexedVideoReader:
+    """
+    Обёртка над cv2.VideoCapture с проверяемой перемоткой. Индекс даёт точность,
+    а не скорость: перемотка — это обычный CAP_PROP_POS_FRAMES (OpenCV сам
+    декодирует от предыдущего ключевого кадра), после которой позиция сверяется
+    с временной меткой из индекса; при расхождении — последовательный проход с начала.
+    Единственное ускорение — перемотка вперёд внутри того же GOP делается через grab().
+    """
+
+    def __init__(self, video_path, index=None):
+        self.video_path = video_path
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise FileNotFoundError(f"Cannot open video: {video_path}")
+        self.index = index or FrameIndex.open(video_path)
+        self.pos = 0
+        self._verify = False
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        if self.pos >= len(self.index):
+            return False, None
+        ret, frame = self.cap.read()
+        if ret and self._verify:
+            self._verify = False
+            if not self._at(self.pos):
+                self._seek_sequential(self.pos)
+                ret, frame = self.cap.read()
+        if ret:
+            self.pos += 1
+        return ret, frame
+
+    def _at(self, frame):
+        return abs(self.cap.get(cv2.CAP_PROP_POS_MSEC) - self.index.timestamps[frame]) <= TIMESTAMP_TOLERANCE_MS
+
+    def _seek_sequential(self, frame):
+        self.cap.release()
+        self.cap = cv2.VideoCapture(self.video_path)
+        for _ in range(frame):
+            self.cap.grab()
+
+    def seek(self, frame):
+        frame = max(0, min(int(frame), len(self.index)))
+        if frame == self.pos or frame == len(self.index):
+            self.pos = frame
+            return
+
+        keyframe = self.index.keyframe_before(frame)
+        if keyframe is not None and keyframe <= self.pos < frame:
+            # Тот же GOP: OpenCV всё равно декодировал бы от keyframe, дочитать дешевле
+            for _ in range(frame - self.pos):
+                self.cap.grab()
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame)
+        self.pos = frame
+        self._verify = True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.index)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.pos
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return self.cap.set(prop, value)
+        self.seek(value)
+        return True
+
+    def release(self):
+        self.cap.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a frame index sidecar for exact seeking")
+    parser.add_argument("input", help="Input video path")
+    args = parser.parse_args()
+
+    index = FrameIndex.build(args.input)
+    index.save(index_path(args.input))
+    print(f"Indexed {len(index)} frames, {len(index.keyframes)} keyframes: {index_path(args.input)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import cv2
+import numpy as np
+
+
+META_FILE = "meta.json"
+FRAMES_FILE = "frames.raw"
+
+
+class FrameStore:
+    """
+    Предекодированное видео: сырые BGR-кадры в memory-mapped файле + meta.json.
+    Повторяет интерфейс cv2.VideoCapture, который использует VideoProcessor,
+    поэтому может подставляться вместо пути к видео. read() возвращает
+    view на mmap без копирования (только для чтения).
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.path = path
+        self.fps = self.meta["fps"]
+        self.width = self.meta["width"]
+        self.height = self.meta["height"]
+        self.frame_count = self.meta["frame_count"]
+        self.frames = np.memmap(
+            os.path.join(path, FRAMES_FILE), dtype=np.uint8, mode="r",
+            shape=(self.frame_count, self.height, self.width, 3)
+        ) if self.frame_count else np.empty((0, self.height, self.width, 3), np.uint8)
+        self.pos = 0
+
+    @staticmethod
+    def is_store(path):
+        return isinstance(path, str) and os.path.isfile(os.path.join(path, META_FILE))
+
+    @classmethod
+    def create(cls, video_path, path, scale=1.0):
+        if scale <= 0:
+            raise ValueError(f"scale must be positive, got {scale}")
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Cannot open video: {video_path}")
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) * scale)
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) * scale)
+        if width < 1 or height < 1:
+            cap.release()
+            raise ValueError(f"scale {scale} gives an empty {width}x{height} frame")
+
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        frame_count = 0
+        with open(os.path.join(path, FRAMES_FILE), "wb") as f:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if scale != 1.0:
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+                f.write(np.ascontiguousarray(frame).tobytes())
+                frame_count += 1
+        cap.release()
+
+        # meta.json пишется последним: его наличие означает, что хранилище полное
+        meta = {
+            "source": video_path,
+            "fps": fps,
+            "width": width,
+            "height": height,
+            "frame_count": frame_count,
+            "scale": scale,
+        }
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(meta_path + ".tmp", meta_path)
+        return cls(path)
+
+    def __len__(self):
+        return self.frame_count
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.pos >= self.frame_count:
+            return False, None
+        frame = self.frames[self.pos]
+        self.pos += 1
+        return True, frame
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.height
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.pos
+        return 0
+
+    def set(self, prop, value):
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        self.pos = max(0, min(int(value), self.frame_count))
+        return True
+
+    def release(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode a video into a memory-mapped frame store")
+    parser.add_argument("input", help="Input video path")
+    parser.add_argument("output", help="Frame store directory")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Downscale factor for stored frames (default: 1.0)")
+    args = parser.parse_args()
+    if args.scale <= 0:
+        parser.error("--scale must be positive")
+
+    store = FrameStore.create(args.input, args.output, args.scale)
+    print(f"Stored {len(store)} frames ({store.width}x{store.height} @ {store.fps:.2f} fps): {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import json
+import os
+
+
+# Профиль производительности хоста, который записывает src.autotune и читает main.py
+DEFAULT_PROFILE_PATH = os.path.join("~", ".config", "squat-analysis", "profile.json")
+PROFILE_ENV = "SQUAT_PROFILE"
+
+DEFAULTS = {
+    "model_complexity": 1,
+    "detection_scale": 1.0,
+    "workers": 1,
+}
+
+
+def profile_path(path=None):
+    return os.path.expanduser(path or os.environ.get(PROFILE_ENV) or DEFAULT_PROFILE_PATH)
+
+
+def load_profile(path=None):
+    """Настройки из профиля хоста; пустой словарь, если профиля нет."""
+    path = profile_path(path)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    return {key: data["settings"][key] for key in DEFAULTS if key in data.get("settings", {})}
+
+
+def save_profile(settings, path=None, **info):
+    path = profile_path(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = dict(info, settings={key: settings[key] for key in DEFAULTS})
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(path + ".tmp", path)
+    return path
@@ -0,0 +1,80 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from src.frame_index import FrameIndex
+from src.frame_store import FrameStore
+from src.rep_counter import RepCounter
+from src.video_processor import VideoProcessor
+
+
+def count_frames(input_path):
+    if FrameStore.is_store(input_path):
+        return len(FrameStore(input_path))
+    return len(FrameIndex.open(input_path))
+
+
+def split_range(start, end, parts):
+    step = (end - start) / parts
+    bounds = [start + round(step * i) for i in range(parts)] + [end]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def plan_segments(start, end, workers, warmup=90):
+    """
+    Сегменты (a, b, прогрев). Прогрев не выходит за start, поэтому первый сегмент
+    начинается ровно с запрошенного кадра и результаты не зависят от кадров вне диапазона.
+    """
+    return [(a, b, min(warmup, a - start)) for a, b in split_range(start, end, workers)]
+
+
+def process_segment(input_path, start, end, side="left", warmup=90, processor_kwargs=None):
+    """
+    Обрабатывает кадры [start, end), предварительно прогнав warmup кадров перед start,
+    чтобы EMA и трекинг MediaPipe успели стабилизироваться. Результат приближённый:
+    состояние трекинга и сглаживания MediaPipe зависит от того, с какого кадра начато
+    декодирование, поэтому углы (и даже наличие позы) на отдельных кадрах могут
+    отличаться от последовательного прогона. Поле reps пересчитывает merge_segments.
+    """
+    processor = VideoProcessor(**(processor_kwargs or {}))
+    results = processor.process(input_path, side=side, start_frame=max(0, start - warmup), end_frame=end)
+    return [r for r in results if r["frame"] >= start]
+
+
+def merge_segments(segments, bottom_threshold=90.0, rise_threshold=20.0):
+    """
+    Склеивает сегменты и пересчитывает reps одним RepCounter по всему потоку углов,
+    чтобы состояние счётчика не обрывалось на границах сегментов. Повторы точны
+    относительно склеенных углов, но сами углы приближённые (см. process_segment).
+    """
+    counter = RepCounter(bottom_threshold, rise_threshold)
+    merged = []
+    for results in segments:
+        for r in results:
+            reps, _ = counter.update(r["angle"])
+            merged.append(dict(r, reps=reps))
+    return merged
+
+
+def run_segments(input_path, workers, side="left", start_frame=0, end_frame=None,
+                 warmup=90, processor_kwargs=None, segment_fn=process_segment):
+    # Индекс кадров строится здесь, до запуска процессов: иначе каждый сегмент
+    # со start_frame > 0 строил бы и сохранял его одновременно с остальными
+    frame_count = count_frames(input_path)
+    end_frame = frame_count if end_frame is None else min(end_frame, frame_count)
+    # spawn: fork после инициализации mediapipe в родительском процессе небезопасен
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            pool.submit(segment_fn, input_path, a, b, side, w, processor_kwargs)
+            for a, b, w in plan_segments(start_frame, end_frame, workers, warmup)
+        ]
+        return [f.result() for f in futures]
+
+
+def process_parallel(input_path, workers, side="left", start_frame=0, end_frame=None,
+                     warmup=90, **processor_kwargs):
+    """
+    Параллельная обработка видео по сегментам в нескольких процессах.
+    Результат приближённый: см. process_segment.
+    """
+    segments = run_segments(input_path, workers, side, start_frame, end_frame, warmup, processor_kwargs)
+    return merge_segments(segments, processor_kwargs.get("bottom_threshold", 90.0),
+                          processor_kwargs.get("rise_threshold", 20.0))
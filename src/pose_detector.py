@@ -1,4 +1,3 @@
-import mediapipe as mp
 from src.kinematic_math import Point
 
 
@@ -12,6 +11,8 @@ class LandmarkIndex:
 
 class PoseDetector:
     def __init__(self, model_complexity=1, min_detection_confidence=0.5):
+        # mediapipe импортируется только при создании детектора: сам импорт занимает заметное время
+        import mediapipe as mp
         self.mp_pose = mp.solutions.pose
         self.pose = self.mp_pose.Pose(
             static_image_mode=False,
@@ -28,6 +28,18 @@ class RepCounter:
         
         return self.rep_count, just_completed
     
+    def get_state(self):
+        return {
+            "rep_count": self.rep_count,
+            "min_angle": self.min_angle,
+            "went_below_threshold": self.went_below_threshold,
+        }
+    
+    def set_state(self, state):
+        self.rep_count = state["rep_count"]
+        self.min_angle = state["min_angle"]
+        self.went_below_threshold = state["went_below_threshold"]
+    
     def reset(self):
         self.rep_count = 0
         self.min_angle = None
@@ -0,0 +1,7 @@
+import json
+
+
+def save_results(results, path):
+    """Сохраняет покадровые результаты в JSON. Без cv2 и mediapipe: импорт дешёвый."""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
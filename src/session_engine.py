@@ -0,0 +1,169 @@
+import time
+from typing import NamedTuple
+import numpy as np
+
+
+SIDES = {"left": 0, "right": 1}
+
+# Порядок ключевых точек во входных массивах: как SMOOTHED_INDICES в video_processor
+# (левые бедро/колено/лодыжка, затем правые), каждая точка — (x, y).
+NUM_KEYPOINTS = 6
+
+# Поля состояния сессии: значение по умолчанию, форма на слот, dtype
+_FIELDS = {
+    "points": (np.nan, (NUM_KEYPOINTS, 2), np.float64),
+    "min_angle": (np.nan, (), np.float64),
+    "went_below": (False, (), bool),
+    "rep_count": (0, (), np.int64),
+    "frame": (0, (), np.int64),
+    "side": (0, (), np.int8),
+    "last_seen": (0.0, (), np.float64),
+    "active": (False, (), bool),
+    "session_ids": (None, (), object),
+}
+
+
+class RepEvent(NamedTuple):
+    session_id: object
+    reps: int
+    frame: int
+    angle: float
+
+
+class SessionEngine:
+    """
+    Серверная часть анализа для клиентов, которые сами запускают детекцию позы.
+    Состояние всех сессий хранится как struct-of-arrays (по слоту на сессию),
+    а EMA, угол в колене и логика RepCounter считаются векторно за тик.
+    Отсутствующая поза передаётся как NaN и, как в VideoProcessor, не меняет состояние.
+    """
+
+    def __init__(self, capacity=1024, bottom_threshold=90.0, rise_threshold=20.0,
+                 ema_alpha=0.3, idle_timeout=30.0):
+        self.bottom_threshold = bottom_threshold
+        self.rise_threshold = rise_threshold
+        self.ema_alpha = ema_alpha
+        self.idle_timeout = idle_timeout
+
+        self.slots = {}  # session_id -> slot
+        self._free = []
+        self._size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        for name, (fill, shape, dtype) in _FIELDS.items():
+            new = np.full((capacity,) + shape, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                new[:len(old)] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.slots)
+
+    def open_session(self, session_id, side="left", now=None):
+        if session_id in self.slots:
+            raise ValueError(f"Session already open: {session_id}")
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._size == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self._size
+            self._size += 1
+
+        self.points[slot] = np.nan
+        self.min_angle[slot] = np.nan
+        self.went_below[slot] = False
+        self.rep_count[slot] = 0
+        self.frame[slot] = 0
+        self.side[slot] = SIDES[side]
+        self.last_seen[slot] = time.monotonic() if now is None else now
+        self.active[slot] = True
+        self.session_ids[slot] = session_id
+        self.slots[session_id] = slot
+        return slot
+
+    def close_session(self, session_id):
+        slot = self.slots.pop(session_id)
+        self.active[slot] = False
+        self.session_ids[slot] = None
+        self._free.append(slot)
+        return self.rep_count[slot]
+
+    def evict_idle(self, now=None):
+        now = time.monotonic() if now is None else now
+        idle = np.flatnonzero(self.active[:self._size] & (now - self.last_seen[:self._size] > self.idle_timeout))
+        evicted = [self.session_ids[slot] for slot in idle]
+        for session_id in evicted:
+            self.close_session(session_id)
+        return evicted
+
+    def update(self, session_ids, keypoints, now=None):
+        """
+        Один кадр для каждой из перечисленных сессий.
+        keypoints: массив (n, 6, 2); каждая сессия — не более одного раза за вызов.
+        """
+        slots = np.fromiter((self.slots[s] for s in session_ids), dtype=np.intp, count=len(session_ids))
+        return self.update_slots(slots, keypoints, now)
+
+    def update_slots(self, slots, keypoints, now=None):
+        now = time.monotonic() if now is None else now
+        slots = np.asarray(slots, dtype=np.intp)
+        keypoints = np.asarray(keypoints, dtype=np.float64)
+        self.last_seen[slots] = now
+        frames = self.frame[slots]
+        self.frame[slots] += 1
+
+        has_pose = ~np.isnan(keypoints).any(axis=(1, 2))
+        slots = slots[has_pose]
+        frames = frames[has_pose]
+        current = keypoints[has_pose]
+
+        # EMA по всем точкам скелета (apply_ema_point)
+        prev = self.points[slots]
+        smoothed = np.where(np.isnan(prev), current, self.ema_alpha * current + (1 - self.ema_alpha) * prev)
+        self.points[slots] = smoothed
+
+        # Угол в колене выбранной стороны (calculate_angle)
+        leg = smoothed.reshape(-1, 2, 3, 2)[np.arange(len(slots)), self.side[slots]]
+        hip, knee, ankle = leg[:, 0], leg[:, 1], leg[:, 2]
+        angle_ba = np.arctan2(hip[:, 1] - knee[:, 1], hip[:, 0] - knee[:, 0])
+        angle_bc = np.arctan2(ankle[:, 1] - knee[:, 1], ankle[:, 0] - knee[:, 0])
+        angle = np.abs(np.degrees(angle_ba - angle_bc))
+        angle = np.where(angle > 180, 360 - angle, angle)
+
+        # Подсчёт повторений (RepCounter.update)
+        below = angle <= self.bottom_threshold
+        min_angle = self.min_angle[slots]
+        min_angle = np.where(below & ~(min_angle <= angle), angle, min_angle)
+        went_below = self.went_below[slots] | below
+        completed = went_below & (angle >= min_angle + self.rise_threshold)
+        went_below &= ~completed
+        min_angle[completed] = np.nan
+        self.min_angle[slots] = min_angle
+        self.went_below[slots] = went_below
+        self.rep_count[slots] += completed
+
+        return [
+            RepEvent(self.session_ids[slot], int(self.rep_count[slot]), int(frame), float(a))
+            for slot, frame, a in zip(slots[completed], frames[completed], angle[completed])
+        ]
+
+    def ingest(self, batches, now=None):
+        """
+        Пакеты кадров от клиентов: {session_id: массив (T, 6, 2)}.
+        Кадры применяются по шагам: на шаге k — k-й кадр каждой сессии, у которой он есть.
+        """
+        slots = np.fromiter((self.slots[s] for s in batches), dtype=np.intp, count=len(batches))
+        lengths = np.array([len(b) for b in batches.values()], dtype=np.intp)
+        padded = np.full((len(batches), lengths.max(initial=0), NUM_KEYPOINTS, 2), np.nan)
+        for i, b in enumerate(batches.values()):
+            padded[i, :lengths[i]] = b
+
+        events = []
+        for step in range(padded.shape[1]):
+            idx = np.flatnonzero(lengths > step)
+            events.extend(self.update_slots(slots[idx], padded[idx, step], now))
+        return events
@@ -0,0 +1,92 @@
+import argparse
+import time
+import numpy as np
+from src.session_engine import SessionEngine, NUM_KEYPOINTS
+
+
+def synthetic_keypoints(t, period, phase, dropout=0.0, noise=0.002, rng=None):
+    """
+    Кадр для каждой сессии: колено сгибается от ~175° до ~60° и обратно с периодом period.
+    Возвращает массив (n, 6, 2); с вероятностью dropout поза «теряется» (NaN).
+    """
+    rng = rng or np.random.default_rng()
+    n = len(period)
+    theta = np.radians(117.5 + 57.5 * np.cos(2 * np.pi * (t + phase) / period))
+
+    keypoints = np.empty((n, NUM_KEYPOINTS, 2))
+    keypoints[:, 0] = (0.5, 0.3)  # бедро
+    keypoints[:, 1] = (0.5, 0.5)  # колено
+    keypoints[:, 2, 0] = 0.5 + 0.2 * np.sin(theta)  # лодыжка
+    keypoints[:, 2, 1] = 0.5 - 0.2 * np.cos(theta)
+    keypoints[:, 3:] = keypoints[:, :3]
+    keypoints += rng.normal(0, noise, keypoints.shape)
+    keypoints[rng.random(n) < dropout] = np.nan
+    return keypoints
+
+
+def run(sessions, ticks, batch=1, fps=30.0, churn=0.001, dropout=0.01, seed=0):
+    rng = np.random.default_rng(seed)
+    engine = SessionEngine(capacity=sessions, idle_timeout=2.0)
+    period = rng.uniform(45, 120, sessions)
+    phase = rng.uniform(0, 120, sessions)
+
+    ids = list(range(sessions))
+    for session_id in ids:
+        engine.open_session(session_id, now=0.0)
+    next_id = sessions
+
+    events = 0
+    frames = 0
+    elapsed = 0.0
+    for tick in range(ticks):
+        now = tick * batch / fps
+        batch_frames = np.stack([
+            synthetic_keypoints(tick * batch + k, period, phase, dropout, rng=rng) for k in range(batch)
+        ], axis=1)
+
+        # Часть клиентов замолкает (их вытеснит evict_idle), вместо них подключаются новые
+        silent = rng.random(sessions) < churn
+
+        start = time.perf_counter()
+        live = [i for i, s in enumerate(silent) if not s]
+        if batch == 1:
+            events += len(engine.update([ids[i] for i in live], batch_frames[live, 0], now))
+        else:
+            events += len(engine.ingest({ids[i]: batch_frames[i] for i in live}, now))
+        engine.evict_idle(now)
+        for i in np.flatnonzero(silent):
+            ids[i] = next_id
+            engine.open_session(next_id, now=now)
+            next_id += 1
+        elapsed += time.perf_counter() - start
+        frames += len(live) * batch
+
+    return {
+        "sessions": sessions,
+        "ticks": ticks,
+        "frames": frames,
+        "rep_events": events,
+        "elapsed_s": elapsed,
+        "frames_per_s": frames / elapsed,
+        "realtime_sessions": frames / elapsed / fps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local load generator for SessionEngine")
+    parser.add_argument("--sessions", type=int, default=10000, help="Concurrent sessions (default: 10000)")
+    parser.add_argument("--ticks", type=int, default=300, help="Number of ticks (default: 300)")
+    parser.add_argument("--batch", type=int, default=1, help="Frames per client per tick (default: 1)")
+    parser.add_argument("--fps", type=float, default=30.0, help="Client frame rate (default: 30)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    stats = run(args.sessions, args.ticks, args.batch, args.fps, seed=args.seed)
+    print(f"Sessions: {stats['sessions']}, ticks: {stats['ticks']}, frames: {stats['frames']}")
+    print(f"Rep events: {stats['rep_events']}")
+    print(f"Engine time: {stats['elapsed_s']:.2f} s, {stats['frames_per_s']:.0f} frames/s")
+    print(f"Real-time capacity at {args.fps:g} fps: {stats['realtime_sessions']:.0f} sessions")
+
+
+if __name__ == "__main__":
+    main()
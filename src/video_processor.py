@@ -1,8 +1,12 @@
 import cv2
-import json
+import os
 from src.pose_detector import PoseDetector, LandmarkIndex
 from src.kinematic_math import Point, calculate_angle, apply_ema, apply_ema_point
 from src.rep_counter import RepCounter
+from src.checkpoint import CheckpointStore
+from src.frame_store import FrameStore
+from src.frame_index import IndexedVideoReader
+from src.results import save_results
 
 
 SKELETON_CONNECTIONS = [
@@ -20,8 +24,11 @@ SMOOTHED_INDICES = [
 
 
 class VideoProcessor:
-    def __init__(self, bottom_threshold=90.0, rise_threshold=20.0, ema_alpha=0.3):
-        self.detector = PoseDetector()
+    def __init__(self, bottom_threshold=90.0, rise_threshold=20.0, ema_alpha=0.3,
+                 model_complexity=1, detection_scale=1.0):
+        self.detector = PoseDetector(model_complexity=model_complexity)
+        self.model_complexity = model_complexity
+        self.detection_scale = detection_scale  # уменьшение кадра перед детекцией позы
         self.counter = RepCounter(bottom_threshold, rise_threshold)
         self.ema_alpha = ema_alpha
         self.prev_angle = None
@@ -34,10 +41,81 @@ class VideoProcessor:
         self.prev_points[idx] = smoothed
         return smoothed
     
-    def process(self, input_path, output_path=None, side="left"):
+    @staticmethod
+    def _input_identity(input_path):
+        # Чекпоинт привязан к конкретному входу: другое видео или перекодированная копия отклоняются
+        if isinstance(input_path, FrameStore):
+            return {"frame_store": input_path.meta}
+        if FrameStore.is_store(input_path):
+            return {"frame_store": FrameStore(input_path).meta}
+        stat = os.stat(input_path)
+        return {"path": os.path.abspath(input_path), "size": stat.st_size, "mtime": stat.st_mtime}
+    
+    def _settings(self, input_path, side, start_frame=0, end_frame=None):
+        return {
+            "input": self._input_identity(input_path),
+            "side": side,
+            "start_frame": start_frame,
+            "end_frame": end_frame,
+            "ema_alpha": self.ema_alpha,
+            "bottom_threshold": self.counter.bottom_threshold,
+            "rise_threshold": self.counter.rise_threshold,
+            "model_complexity": self.model_complexity,
+            "detection_scale": self.detection_scale,
+        }
+    
+    def get_state(self, input_path, side, start_frame=0, end_frame=None):
+        return {
+            "settings": self._settings(input_path, side, start_frame, end_frame),
+            "prev_angle": self.prev_angle,
+            "prev_points": {str(idx): list(p) for idx, p in self.prev_points.items()},
+            "counter": self.counter.get_state(),
+        }
+    
+    def set_state(self, state):
+        self.prev_angle = state["prev_angle"]
+        self.prev_points = {int(idx): Point(*p) for idx, p in state["prev_points"].items()}
+        self.counter.set_state(state["counter"])
+    
+    def _restore_checkpoint(self, checkpoint, cap, input_path, side, start_frame, end_frame):
+        state, results = checkpoint.load()
+        settings = self._settings(input_path, side, start_frame, end_frame)
+        if state["settings"]["input"] != settings["input"]:
+            raise ValueError(f"Checkpoint {checkpoint.path} was made for a different input")
+        if state["settings"] != settings:
+            raise ValueError(f"Checkpoint {checkpoint.path} was made with different settings")
+        self.set_state(state)
+        frame_num = state["frame"]
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+        return frame_num, results
+    
+    def _open_source(self, input_path, seekable=False):
+        # Источник кадров: путь к видео, каталог FrameStore или уже открытый FrameStore
+        if isinstance(input_path, FrameStore):
+            return input_path
+        if FrameStore.is_store(input_path):
+            return FrameStore(input_path)
+        if seekable and os.path.isfile(input_path):
+            return IndexedVideoReader(input_path)
         cap = cv2.VideoCapture(input_path)
         if not cap.isOpened():
             raise FileNotFoundError(f"Cannot open video: {input_path}")
+        return cap
+    
+    def process(self, input_path, output_path=None, side="left",
+                checkpoint_path=None, checkpoint_every=1000, resume=False,
+                start_frame=0, end_frame=None):
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+        if resume and checkpoint_path is None:
+            raise ValueError("resume requires checkpoint_path")
+        if resume and output_path:
+            # mp4 нельзя дописать, поэтому аннотированное видео после возобновления было бы неполным
+            raise ValueError("Cannot resume with annotated video output")
+        
+        cap = self._open_source(input_path, seekable=start_frame > 0 or resume)
+        
+        checkpoint = CheckpointStore(checkpoint_path) if checkpoint_path else None
         
         fps = int(cap.get(cv2.CAP_PROP_FPS))
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -49,14 +127,29 @@ class VideoProcessor:
             writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
         
         results = []
-        frame_num = 0
+        frame_num = start_frame
+        if checkpoint and resume and checkpoint.exists():
+            frame_num, results = self._restore_checkpoint(checkpoint, cap, input_path, side, start_frame, end_frame)
+        else:
+            if checkpoint:
+                checkpoint.clear()
+            # Уже открытый FrameStore может стоять в конце после предыдущего прогона
+            if cap.get(cv2.CAP_PROP_POS_FRAMES) != start_frame:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        saved_count = len(results)
         
-        while True:
+        while end_frame is None or frame_num < end_frame:
             ret, frame = cap.read()
             if not ret:
                 break
+            if writer and not frame.flags.writeable:
+                frame = frame.copy()  # кадры FrameStore read-only, а рисуем поверх
             
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if self.detection_scale != 1.0:
+                # Координаты точек нормированы, поэтому уменьшение не влияет на отрисовку
+                frame_rgb = cv2.resize(frame_rgb, None, fx=self.detection_scale, fy=self.detection_scale,
+                                       interpolation=cv2.INTER_AREA)
             landmarks = self.detector.detect(frame_rgb)
             
             if landmarks:
@@ -108,11 +201,17 @@ class VideoProcessor:
                 writer.write(frame)
             
             frame_num += 1
+            
+            if checkpoint and frame_num % checkpoint_every == 0:
+                checkpoint.save(dict(self.get_state(input_path, side, start_frame, end_frame), frame=frame_num), results[saved_count:])
+                saved_count = len(results)
         
         cap.release()
         if writer:
             writer.release()
         self.detector.close()
+        if checkpoint:
+            checkpoint.clear()
         
         return results
     
@@ -141,5 +240,4 @@ class VideoProcessor:
                     cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 2)
     
     def save_results(self, results, path):
-        with open(path, 'w') as f:
-            json.dump(results, f, indent=2)
+        save_results(results, path)
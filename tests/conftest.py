@@ -0,0 +1,45 @@
+import pytest
+import cv2
+import numpy as np
+from types import SimpleNamespace
+
+
+def write_video(path, n_frames=30):
+    """Synthetic 64x48 mp4v video: brightness cycles every 16 frames, and a bar moving
+    one column per frame makes every frame distinct."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (64, 48))
+    for i in range(n_frames):
+        level = 250 - abs(i % 16 - 8) * 30
+        frame = np.full((48, 64, 3), level, dtype=np.uint8)
+        frame[:, i % 56:i % 56 + 8] = 255 - level
+        writer.write(frame)
+    writer.release()
+
+
+def _fake_detect(frame):
+    """Landmarks derived from frame brightness, so they depend only on the frame itself."""
+    v = float(frame.mean()) / 255
+    landmarks = [SimpleNamespace(x=0.5, y=0.5) for _ in range(33)]
+    landmarks[23] = landmarks[24] = SimpleNamespace(x=0.5, y=0.3)
+    landmarks[27] = landmarks[28] = SimpleNamespace(x=0.5 + 0.4 * v, y=0.7 - 0.3 * v)
+    return landmarks
+
+
+@pytest.fixture
+def make_video(tmp_path):
+    """Factory writing a synthetic video into tmp_path; returns its path."""
+    def make(n_frames=30, name="in.mp4"):
+        path = str(tmp_path / name)
+        write_video(path, n_frames)
+        return path
+    return make
+
+
+@pytest.fixture
+def video(make_video):
+    return make_video()
+
+
+@pytest.fixture
+def fake_detect():
+    return _fake_detect
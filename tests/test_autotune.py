@@ -0,0 +1,130 @@
+import pytest
+import os
+import tempfile
+from unittest.mock import patch
+from src import autotune
+from src.host_profile import DEFAULTS, load_profile, save_profile
+
+
+def _results(rep_frames, angle=100.0, length=100):
+    """Per-frame results with a rep completed at each of rep_frames."""
+    return [{"frame": i, "angle": angle, "status": "UP", "reps": sum(f <= i for f in rep_frames)}
+            for i in range(length)]
+
+
+class TestHostProfile:
+    def test_roundtrip(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "sub", "profile.json")
+            settings = {"model_complexity": 0, "detection_scale": 0.5, "workers": 4}
+            
+            save_profile(settings, path, host="test")
+            
+            assert load_profile(path) == settings
+    
+    def test_missing_profile(self):
+        assert load_profile("/nonexistent/profile.json") == {}
+    
+    def test_env_path(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "profile.json")
+            save_profile(dict(DEFAULTS, workers=3), path)
+            monkeypatch.setenv("SQUAT_PROFILE", path)
+            
+            assert load_profile()["workers"] == 3
+
+
+class TestProjectedFps:
+    def test_single_worker(self):
+        assert autotune.projected_fps(1000, 1, startup=0.0, segment_fps=20.0) == 20.0
+    
+    def test_startup_amortized_over_long_video(self):
+        # 4 workers at 10 fps each with 5 s of startup vs. 1 worker at 20 fps with 1 s
+        short = autotune.projected_fps(300, 4, 5.0, 10.0), autotune.projected_fps(300, 1, 1.0, 20.0)
+        long = autotune.projected_fps(18000, 4, 5.0, 10.0), autotune.projected_fps(18000, 1, 1.0, 20.0)
+        
+        assert short[0] < short[1]
+        assert long[0] > long[1]
+
+
+class TestAutotune:
+    def test_agreement(self):
+        reps_match, error = autotune.agreement(_results([20, 61], 95.0), _results([20, 60], 100.0))
+        
+        assert reps_match
+        assert error == 5.0
+    
+    def test_agreement_compares_rep_frames(self):
+        # Same final count, but the first rep completes 30 frames late
+        reps_match, _ = autotune.agreement(_results([50, 60]), _results([20, 60]))
+        
+        assert not reps_match
+    
+    def test_reference_without_reps_refused(self):
+        def fake_benchmark(input_path, config, frames, side="left", target_frames=None):
+            return _results([]), 10.0
+        
+        with patch.object(autotune, "benchmark", fake_benchmark):
+            with pytest.raises(ValueError, match="No completed reps"):
+                autotune.autotune("clip.mp4", configs=[], log=lambda *_: None)
+    
+    def test_picks_fastest_agreeing_config(self):
+        runs = {
+            (1, 1.0, 1): (_results([20, 50, 80]), 10.0),
+            (1, 0.5, 1): (_results([21, 50, 79], 101.0), 20.0),
+            (0, 1.0, 1): (_results([20, 50]), 50.0),  # faster but miscounts reps
+        }
+        
+        def fake_benchmark(input_path, config, frames, side="left", target_frames=None):
+            return runs[(config["model_complexity"], config["detection_scale"], config["workers"])]
+        
+        configs = [{"model_complexity": mc, "detection_scale": s, "workers": w} for mc, s, w in runs]
+        with patch.object(autotune, "benchmark", fake_benchmark), \
+                patch.object(autotune, "model_available", lambda mc: True):
+            best, fps, measurements = autotune.autotune("clip.mp4", configs=configs, log=lambda *_: None)
+        
+        assert best == {"model_complexity": 1, "detection_scale": 0.5, "workers": 1}
+        assert fps == 20.0
+        assert len(measurements) == 3
+    
+    def test_noise_does_not_switch(self):
+        def fake_benchmark(input_path, config, frames, side="left", target_frames=None):
+            return _results([20]), 10.0 if config == DEFAULTS else 10.2
+        
+        configs = [{"model_complexity": 1, "detection_scale": 0.75, "workers": 1}]
+        with patch.object(autotune, "benchmark", fake_benchmark), \
+                patch.object(autotune, "model_available", lambda mc: True):
+            best, _, _ = autotune.autotune("clip.mp4", configs=configs, log=lambda *_: None)
+        
+        assert best == DEFAULTS
+    
+    def test_unavailable_model_skipped(self):
+        calls = []
+        
+        def fake_benchmark(input_path, config, frames, side="left", target_frames=None):
+            calls.append(config)
+            return _results([20]), 10.0
+        
+        configs = [{"model_complexity": 2, "detection_scale": s, "workers": 1} for s in (1.0, 0.5)]
+        with patch.object(autotune, "benchmark", fake_benchmark), \
+                patch.object(autotune, "model_available", lambda mc: mc != 2):
+            best, _, _ = autotune.autotune("clip.mp4", configs=configs, log=lambda *_: None)
+        
+        assert best == DEFAULTS
+        assert calls == [DEFAULTS, DEFAULTS]  # warm-up and reference only
+    
+    def test_benchmark_errors_propagate(self):
+        def fake_benchmark(input_path, config, frames, side="left", target_frames=None):
+            if config != DEFAULTS:
+                raise FileNotFoundError("race")
+            return _results([20]), 10.0
+        
+        configs = [{"model_complexity": 1, "detection_scale": 0.5, "workers": 1}]
+        with patch.object(autotune, "benchmark", fake_benchmark), \
+                patch.object(autotune, "model_available", lambda mc: True):
+            with pytest.raises(FileNotFoundError):
+                autotune.autotune("clip.mp4", configs=configs, log=lambda *_: None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
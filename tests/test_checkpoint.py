@@ -0,0 +1,59 @@
+import pytest
+import os
+import json
+import tempfile
+from src.checkpoint import CheckpointStore
+
+
+@pytest.fixture
+def store():
+    with tempfile.TemporaryDirectory() as d:
+        yield CheckpointStore(os.path.join(d, "run.ckpt"))
+
+
+class TestCheckpointStore:
+    def test_save_and_load(self, store):
+        results = [{"frame": i, "angle": 170.0, "status": "UP", "reps": 0} for i in range(3)]
+        store.save({"frame": 3, "value": 1}, results)
+        
+        state, loaded = store.load()
+        
+        assert state == {"frame": 3, "value": 1}
+        assert loaded == results
+    
+    def test_results_are_appended(self, store):
+        store.save({"frame": 2}, [{"frame": 0}, {"frame": 1}])
+        store.save({"frame": 3}, [{"frame": 2}])
+        
+        state, loaded = store.load()
+        
+        assert state["frame"] == 3
+        assert [r["frame"] for r in loaded] == [0, 1, 2]
+    
+    def test_uncommitted_results_discarded(self, store):
+        """Lines written after the last checkpoint (crash mid-save) are dropped."""
+        store.save({"frame": 1}, [{"frame": 0}])
+        with open(store.results_path, "a") as f:
+            f.write(json.dumps({"frame": 1}) + "\n")
+        
+        state, loaded = store.load()
+        
+        assert loaded == [{"frame": 0}]
+        assert os.path.getsize(store.results_path) == len(json.dumps({"frame": 0})) + 1
+    
+    def test_no_tmp_file_left(self, store):
+        store.save({"frame": 0}, [])
+        
+        assert store.exists()
+        assert not os.path.exists(store.path + ".tmp")
+    
+    def test_clear(self, store):
+        store.save({"frame": 1}, [{"frame": 0}])
+        store.clear()
+        
+        assert not store.exists()
+        assert not os.path.exists(store.results_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
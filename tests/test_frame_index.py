@@ -0,0 +1,138 @@
+import pytest
+import os
+import time
+import numpy as np
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from src.frame_index import FrameIndex, IndexedVideoReader, index_path
+
+
+def _decode_all(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+class _OffByOneCapture:
+    """Simulates a container where CAP_PROP_POS_FRAMES seeking lands one frame late."""
+    
+    def __init__(self, cap):
+        self.cap = cap
+    
+    def set(self, prop, value):
+        return self.cap.set(prop, value + 1)
+    
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+
+
+class TestFrameIndex:
+    def test_build(self, video):
+        index = FrameIndex.build(video)
+        
+        assert len(index) == 30
+        assert index.keyframes[0] == 0
+        assert index.timestamps == sorted(index.timestamps)
+        assert index.timestamps[1] == pytest.approx(1000 / 30)
+    
+    def test_keyframe_before(self):
+        index = FrameIndex([0.0] * 30, [0, 12, 24], 30)
+        
+        assert index.keyframe_before(0) == 0
+        assert index.keyframe_before(13) == 12
+        assert index.keyframe_before(29) == 24
+    
+    def test_open_writes_and_reuses_sidecar(self, video):
+        index = FrameIndex.open(video)
+        
+        assert os.path.exists(index_path(video))
+        assert FrameIndex.open(video).timestamps == index.timestamps
+    
+    def test_stale_sidecar_rebuilt(self, video):
+        FrameIndex([0.0], [0], 30, source_size=1, source_mtime=0).save(index_path(video))
+        
+        assert len(FrameIndex.open(video)) == 30
+    
+    def test_unwritable_sidecar_uses_memory_index(self, video):
+        with patch.object(FrameIndex, "save", side_effect=PermissionError("read-only")):
+            index = FrameIndex.open(video)
+        
+        assert len(index) == 30
+        assert not os.path.exists(index_path(video))
+    
+    def test_concurrent_saves(self, video):
+        index = FrameIndex.build(video)
+        path = index_path(video)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: index.save(path), range(32)))
+        
+        assert len(FrameIndex.load(path)) == 30
+        assert sorted(os.listdir(os.path.dirname(path))) == sorted(["in.mp4", os.path.basename(path)])
+
+
+class TestIndexedVideoReader:
+    def test_exact_seek(self, video):
+        frames = _decode_all(video)
+        reader = IndexedVideoReader(video)
+        
+        for n in [25, 3, 29, 0, 17, 18, 12]:
+            reader.set(cv2.CAP_PROP_POS_FRAMES, n)
+            ret, frame = reader.read()
+            assert ret
+            assert np.array_equal(frame, frames[n]), f"frame {n}"
+            assert reader.get(cv2.CAP_PROP_POS_FRAMES) == n + 1
+        reader.release()
+    
+    def test_recovers_from_inexact_seek(self, video):
+        frames = _decode_all(video)
+        reader = IndexedVideoReader(video)
+        reader.index.keyframes = [0, 20]
+        reader.cap = _OffByOneCapture(reader.cap)
+        
+        reader.set(cv2.CAP_PROP_POS_FRAMES, 22)
+        _, frame = reader.read()
+        
+        assert np.array_equal(frame, frames[22])
+    
+    def test_read_to_end(self, video):
+        reader = IndexedVideoReader(video)
+        reader.set(cv2.CAP_PROP_POS_FRAMES, 28)
+        
+        assert reader.read()[0]
+        assert reader.read()[0]
+        assert reader.read() == (False, None)
+    
+    def test_seek_not_slower_than_plain_cv2(self):
+        """On a real H.264 clip with long GOPs, the indexed seek costs no more than CAP_PROP_POS_FRAMES."""
+        video = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "input.mp4")
+        if not os.path.exists(video):
+            pytest.skip("input.mp4 not available")
+        targets = [300, 40, 210, 120, 390, 170]
+        index = FrameIndex.build(video)
+        
+        def timed(cap):
+            start = time.perf_counter()
+            for n in targets:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, n)
+                cap.read()
+            return time.perf_counter() - start
+        
+        indexed = IndexedVideoReader(video, index)
+        plain = cv2.VideoCapture(video)
+        timed(plain)  # warm the file cache
+        plain_time = timed(cv2.VideoCapture(video))
+        indexed_time = timed(indexed)
+        
+        assert indexed_time <= plain_time * 1.25 + 0.05, f"indexed {indexed_time:.2f}s vs plain {plain_time:.2f}s"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
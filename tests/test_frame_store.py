@@ -0,0 +1,82 @@
+import pytest
+import os
+import numpy as np
+import cv2
+from src.frame_store import FrameStore
+from src.video_processor import VideoProcessor
+
+
+class TestFrameStore:
+    def test_create_matches_decoded_frames(self, tmp_path, video):
+        store = FrameStore.create(video, os.path.join(tmp_path, "store"))
+        
+        cap = cv2.VideoCapture(video)
+        for i in range(len(store)):
+            _, expected = cap.read()
+            ret, frame = store.read()
+            assert ret
+            assert np.array_equal(frame, expected)
+        cap.release()
+        
+        assert len(store) == 30
+        assert store.read() == (False, None)
+    
+    def test_metadata(self, tmp_path, video):
+        store = FrameStore.create(video, os.path.join(tmp_path, "store"), scale=0.5)
+        
+        assert store.get(cv2.CAP_PROP_FPS) == 30
+        assert (store.width, store.height) == (32, 24)
+        assert store.read()[1].shape == (24, 32, 3)
+    
+    def test_invalid_scale_writes_nothing(self, tmp_path, video):
+        store_path = os.path.join(tmp_path, "store")
+        
+        for scale in (0, -1, 0.001):
+            with pytest.raises(ValueError):
+                FrameStore.create(video, store_path, scale=scale)
+        
+        assert not os.path.exists(store_path)
+    
+    def test_frames_are_readonly_views(self, tmp_path, video):
+        store = FrameStore.create(video, os.path.join(tmp_path, "store"))
+        
+        _, frame = store.read()
+        
+        assert np.shares_memory(frame, store.frames)
+        assert not frame.flags.writeable
+    
+    def test_seek(self, tmp_path, video):
+        store = FrameStore.create(video, os.path.join(tmp_path, "store"))
+        
+        store.set(cv2.CAP_PROP_POS_FRAMES, 5)
+        
+        assert store.get(cv2.CAP_PROP_POS_FRAMES) == 5
+        assert np.array_equal(store.read()[1], store.frames[5])
+    
+    def test_is_store(self, tmp_path, video):
+        FrameStore.create(video, os.path.join(tmp_path, "store"))
+        
+        assert FrameStore.is_store(os.path.join(tmp_path, "store"))
+        assert not FrameStore.is_store(video)
+    
+    def test_processor_accepts_store(self, tmp_path, video):
+        store_path = os.path.join(tmp_path, "store")
+        FrameStore.create(video, store_path)
+        
+        from_video = VideoProcessor().process(video)
+        from_store = VideoProcessor().process(store_path, os.path.join(tmp_path, "out.mp4"))
+        
+        assert from_store == from_video
+    
+    def test_processor_reuses_open_store(self, tmp_path, video):
+        store = FrameStore.create(video, os.path.join(tmp_path, "store"))
+        
+        first = VideoProcessor().process(store)
+        second = VideoProcessor().process(store)
+        
+        assert len(first) == 30
+        assert second == first
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
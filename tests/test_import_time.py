@@ -0,0 +1,66 @@
+import pytest
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("cv2", "mediapipe")
+
+# Бюджет на импорт в секундах; импорт mediapipe сам по себе занимает ~0.5 с
+IMPORT_BUDGET_S = 0.25
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def _probe(body):
+    """Run body in a fresh interpreter; return (elapsed seconds, loaded heavy modules)."""
+    code = PROBE.format(body=body, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout.splitlines()
+    return float(out[-2]), [m for m in out[-1].split(",") if m]
+
+
+class TestImportTime:
+    @pytest.mark.parametrize("module", [
+        "main",
+        "src.kinematic_math",
+        "src.rep_counter",
+        "src.squat_state_controller",
+        "src.pose_detector",
+        "src.results",
+    ])
+    def test_module_import_is_light(self, module):
+        elapsed, loaded = _probe(f"import {module}")
+        
+        assert loaded == []
+        assert elapsed < IMPORT_BUDGET_S, f"import {module} took {elapsed:.3f}s"
+    
+    def test_cli_help_is_light(self):
+        elapsed, loaded = _probe(
+            "import runpy\n"
+            "sys.argv = ['main.py', '--help']\n"
+            "try:\n"
+            "    runpy.run_path('main.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        
+        assert loaded == []
+        assert elapsed < IMPORT_BUDGET_S, f"main.py --help took {elapsed:.3f}s"
+    
+    def test_pose_detector_loads_mediapipe_on_creation(self):
+        _, loaded = _probe("from src.pose_detector import PoseDetector\nPoseDetector().close()")
+        
+        assert "mediapipe" in loaded
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import patch
+from src.parallel import plan_segments, split_range, merge_segments, process_segment, process_parallel
+from src.rep_counter import RepCounter
+from src.video_processor import VideoProcessor
+
+
+class TestSplitRange:
+    def test_covers_range(self):
+        ranges = split_range(10, 101, 4)
+        
+        assert ranges[0][0] == 10
+        assert ranges[-1][1] == 101
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    
+    def test_more_parts_than_frames(self):
+        assert split_range(0, 2, 4) == [(0, 1), (1, 2)]
+
+
+def _results(angles):
+    return [{"frame": i, "angle": a, "status": "", "reps": 0} for i, a in enumerate(angles)]
+
+
+class TestPlanSegments:
+    def test_warmup_stays_inside_range(self):
+        plan = plan_segments(100, 330, 2, warmup=90)
+        
+        assert plan[0] == (100, 215, 0)
+        assert plan[1] == (215, 330, 90)
+    
+    def test_short_leading_segment(self):
+        assert plan_segments(10, 70, 3, warmup=90) == [(10, 30, 0), (30, 50, 20), (50, 70, 40)]
+
+
+class TestMergeSegments:
+    def test_reps_recounted_across_segments(self):
+        angles = [170, 80, 70, None, 100, 170, 80, 60, 95]
+        results = _results(angles)
+        
+        merged = merge_segments([results[:4], [], results[4:7], results[7:]])
+        
+        counter = RepCounter()
+        assert [r["frame"] for r in merged] == list(range(9))
+        assert [r["reps"] for r in merged] == [counter.update(a)[0] for a in angles]
+    
+    def test_bottom_phase_longer_than_warmup(self):
+        """Pause squat: the deepest point lies before the segment's warm-up window."""
+        angles = [170] * 10 + [60] * 5 + [75] * 150 + [85] * 10 + [100] * 10 + [170] * 10
+        results = _results(angles)
+        
+        # Segment 2 starts at frame 120 with 90-frame warm-up, i.e. after the 60° bottom
+        merged = merge_segments([results[:120], results[120:]])
+        
+        completed = [b["frame"] for a, b in zip(merged, merged[1:]) if b["reps"] > a["reps"]]
+        assert completed == [165, 185]
+        assert merged[-1]["reps"] == 2
+
+
+class TestProcessSegment:
+    def test_segments_match_sequential(self, video, fake_detect):
+        with patch("src.pose_detector.PoseDetector.detect", side_effect=fake_detect):
+            expected = VideoProcessor(rise_threshold=5).process(video)
+            segments = [
+                process_segment(video, a, b, warmup=30, processor_kwargs={"rise_threshold": 5})
+                for a, b in split_range(0, 30, 3)
+            ]
+        
+        assert merge_segments(segments, rise_threshold=5) == expected
+    
+    def test_parallel_no_pose_video(self, make_video):
+        video = make_video(n_frames=12)
+        
+        results = process_parallel(video, workers=2)
+        
+        assert [r["frame"] for r in results] == list(range(12))
+        assert all(r["status"] == "NO POSE" for r in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -67,6 +67,17 @@ class TestRepCounter:
         counter.reset()
         
         assert counter.rep_count == 0
+    
+    def test_state_roundtrip(self):
+        counter = RepCounter()
+        counter.update(80)
+        counter.update(70)
+        
+        restored = RepCounter()
+        restored.set_state(counter.get_state())
+        
+        assert restored.update(100) == counter.update(100)
+        assert restored.rep_count == 1
 
 
 if __name__ == "__main__":
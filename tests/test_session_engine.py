@@ -0,0 +1,138 @@
+import pytest
+import numpy as np
+from src.kinematic_math import Point, calculate_angle, apply_ema_point
+from src.rep_counter import RepCounter
+from src.session_engine import SessionEngine
+from src.session_loadgen import synthetic_keypoints, run
+
+
+def _scalar_pipeline(frames, side=0, alpha=0.3):
+    """Reference: the per-instance objects VideoProcessor uses."""
+    counter = RepCounter()
+    prev = [None] * 6
+    angles, reps = [], []
+    for kp in frames:
+        if np.isnan(kp).any():
+            counter.update(None)
+            continue
+        prev = [apply_ema_point(Point(*kp[i]), prev[i], alpha) for i in range(6)]
+        hip, knee, ankle = prev[3 * side:3 * side + 3]
+        angle = calculate_angle(hip, knee, ankle)
+        angles.append(angle)
+        reps.append(counter.update(angle)[0])
+    return angles, reps
+
+
+def _trajectory(n_frames, n_sessions=3, dropout=0.05):
+    rng = np.random.default_rng(1)
+    period = np.array([40.0, 55.0, 70.0])[:n_sessions]
+    phase = np.array([0.0, 10.0, 25.0])[:n_sessions]
+    return np.stack([synthetic_keypoints(t, period, phase, dropout, rng=rng) for t in range(n_frames)], axis=1)
+
+
+class TestSessionEngine:
+    def test_matches_scalar_pipeline(self):
+        frames = _trajectory(200)
+        engine = SessionEngine()
+        for s in range(3):
+            engine.open_session(s, side="right" if s == 2 else "left", now=0)
+        
+        events = []
+        for t in range(200):
+            events.extend(engine.update([0, 1, 2], frames[:, t], now=0))
+        
+        for s in range(3):
+            _, reps = _scalar_pipeline(frames[s], side=1 if s == 2 else 0)
+            assert engine.rep_count[engine.slots[s]] == reps[-1]
+            assert [e.reps for e in events if e.session_id == s] == list(range(1, reps[-1] + 1))
+        assert engine.rep_count[engine.slots[0]] > 0
+    
+    def test_event_angle_matches_calculate_angle(self):
+        frames = _trajectory(120, dropout=0.0)
+        engine = SessionEngine()
+        engine.open_session("a", now=0)
+        
+        events = []
+        for t in range(120):
+            events.extend(engine.update(["a"], frames[:1, t], now=0))
+        
+        angles, reps = _scalar_pipeline(frames[0])
+        first_rep = reps.index(1)
+        assert events[0].frame == first_rep
+        assert events[0].angle == pytest.approx(angles[first_rep])
+    
+    def test_missing_pose_keeps_state(self):
+        engine = SessionEngine()
+        slot = engine.open_session("a", now=0)
+        engine.update(["a"], _trajectory(1, 1, dropout=0.0)[:, 0], now=0)
+        points = engine.points[slot].copy()
+        
+        engine.update(["a"], np.full((1, 6, 2), np.nan), now=0)
+        
+        assert np.array_equal(engine.points[slot], points)
+        assert engine.frame[slot] == 2
+    
+    def test_ingest_equals_per_frame_updates(self):
+        frames = _trajectory(90)
+        by_frame = SessionEngine()
+        batched = SessionEngine()
+        for s in range(3):
+            by_frame.open_session(s, now=0)
+            batched.open_session(s, now=0)
+        
+        for t in range(90):
+            by_frame.update([0, 1, 2], frames[:, t], now=0)
+        batched.ingest({0: frames[0], 1: frames[1, :60]}, now=0)
+        batched.ingest({1: frames[1, 60:], 2: frames[2]}, now=0)
+        
+        assert np.array_equal(batched.rep_count, by_frame.rep_count)
+        assert np.allclose(batched.points, by_frame.points, equal_nan=True)
+    
+    def test_evict_idle(self):
+        engine = SessionEngine(idle_timeout=10)
+        engine.open_session("a", now=0)
+        engine.open_session("b", now=0)
+        engine.update(["b"], np.full((1, 6, 2), np.nan), now=8)
+        
+        evicted = engine.evict_idle(now=15)
+        
+        assert evicted == ["a"]
+        assert len(engine) == 1
+    
+    def test_slot_reuse_resets_state(self):
+        engine = SessionEngine(capacity=1)
+        engine.open_session("a", now=0)
+        engine.update(["a"], _trajectory(1, 1, dropout=0.0)[:, 0], now=0)
+        engine.close_session("a")
+        
+        slot = engine.open_session("b", now=0)
+        
+        assert slot == 0
+        assert np.isnan(engine.points[slot]).all()
+    
+    def test_capacity_grows(self):
+        engine = SessionEngine(capacity=2)
+        for s in range(5):
+            engine.open_session(s, now=0)
+        
+        assert engine.capacity >= 5
+        assert len(engine) == 5
+    
+    def test_duplicate_session_raises(self):
+        engine = SessionEngine()
+        engine.open_session("a", now=0)
+        
+        with pytest.raises(ValueError):
+            engine.open_session("a", now=0)
+
+
+class TestLoadGenerator:
+    def test_run(self):
+        stats = run(sessions=200, ticks=60)
+        
+        assert stats["frames"] > 0
+        assert stats["rep_events"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
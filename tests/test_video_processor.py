@@ -56,6 +56,76 @@ class TestVideoProcessor:
         os.unlink(temp_path)
         
         assert loaded == results
+    
+    def test_resume_restores_processor_state(self, tmp_path, video, fake_detect):
+        """EMA, counter and results state survive a crash; uses a stateless fake detector,
+        since MediaPipe's own tracking state is not checkpointed."""
+        ckpt = str(tmp_path / "run.ckpt")
+        
+        reference = VideoProcessor(rise_threshold=5)
+        reference.detector.detect = fake_detect
+        expected = reference.process(video)
+        
+        calls = []
+        def crashing_detect(frame):
+            calls.append(1)
+            if len(calls) > 17:
+                raise RuntimeError("simulated crash")
+            return fake_detect(frame)
+        
+        interrupted = VideoProcessor(rise_threshold=5)
+        interrupted.detector.detect = crashing_detect
+        with pytest.raises(RuntimeError):
+            interrupted.process(video, checkpoint_path=ckpt, checkpoint_every=5)
+        
+        resumed = VideoProcessor(rise_threshold=5)
+        resumed.detector.detect = fake_detect
+        results = resumed.process(video, checkpoint_path=ckpt, checkpoint_every=5, resume=True)
+        
+        assert results == expected
+        assert not os.path.exists(ckpt)
+    
+    def test_frame_range(self, video, fake_detect):
+        processor = VideoProcessor()
+        processor.detector.detect = fake_detect
+        results = processor.process(video, start_frame=10, end_frame=20)
+        
+        assert [r["frame"] for r in results] == list(range(10, 20))
+        assert results[0]["reps"] == 0
+    
+    def test_invalid_checkpoint_interval_raises(self):
+        processor = VideoProcessor()
+        with pytest.raises(ValueError):
+            processor.process("nonexistent.mp4", checkpoint_path="run.ckpt", checkpoint_every=0)
+    
+    def test_resume_rejects_different_input(self, tmp_path, make_video):
+        video = make_video(n_frames=10)
+        other = make_video(n_frames=12, name="other.mp4")
+        ckpt = str(tmp_path / "run.ckpt")
+        
+        processor = VideoProcessor()
+        processor.detector.detect = Mock(side_effect=[None] * 5 + [RuntimeError()])
+        with pytest.raises(RuntimeError):
+            processor.process(video, checkpoint_path=ckpt, checkpoint_every=5)
+        
+        with pytest.raises(ValueError, match="different input"):
+            VideoProcessor().process(other, checkpoint_path=ckpt, resume=True)
+        
+        os.utime(video, (0, 0))  # e.g. re-encoded in place
+        with pytest.raises(ValueError, match="different input"):
+            VideoProcessor().process(video, checkpoint_path=ckpt, resume=True)
+    
+    def test_resume_rejects_changed_settings(self, tmp_path, make_video):
+        video = make_video(n_frames=10)
+        ckpt = str(tmp_path / "run.ckpt")
+        
+        processor = VideoProcessor()
+        processor.detector.detect = Mock(side_effect=[None] * 5 + [RuntimeError()])
+        with pytest.raises(RuntimeError):
+            processor.process(video, checkpoint_path=ckpt, checkpoint_every=5)
+        
+        with pytest.raises(ValueError):
+            VideoProcessor(ema_alpha=0.5).process(video, checkpoint_path=ckpt, resume=True)
 
 
 if __name__ == "__main__":